@@ -1,7 +1,54 @@
 #!/usr/bin/env python3
-"""Generate .vscode/tasks.json for Andernet Posture Xcode project."""
+"""Generate .vscode/tasks.json for Andernet Posture Xcode project.
+
+The task list lives in this script, so a fingerprint of its source is kept in
+.vscode/.tasks.sha together with a digest of the tasks.json it wrote; when both
+still match, the run is a no-op.
+Bump SCHEMA_VERSION to force a regenerate without editing the tasks.
+
+The committed tasks.json is 2-space indented so it diffs cleanly; set
+TASKS_PRETTY=0 (or false/no/off) to write compact JSON instead, which VS Code parses the same.
+"""
+import hashlib
 import json
 import os
+import sys
+
+try:
+    import orjson
+except ImportError:  # fall back to the stdlib encoder
+    orjson = None
+
+SCHEMA_VERSION = 1
+# Pretty by default; only an explicit false-like value asks for compact output
+TASKS_PRETTY = os.environ.get("TASKS_PRETTY", "1").strip().lower() not in (
+    "0", "false", "no", "off",
+)
+VSCODE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OUT_PATH = os.path.join(VSCODE_DIR, "tasks.json")
+SHA_PATH = os.path.join(VSCODE_DIR, ".tasks.sha")
+
+
+def digest(payload):
+    """Short blake2b hex digest of payload bytes."""
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+with open(__file__, "rb") as f:
+    SRC_SHA = f"{SCHEMA_VERSION}:{int(TASKS_PRETTY)}:{digest(f.read())}"
+
+# The sidecar holds the source fingerprint and a digest of the tasks.json it
+# produced, so a hand-edited or reverted tasks.json is regenerated too
+try:
+    with open(SHA_PATH) as f:
+        stored = f.read().split()
+    with open(OUT_PATH, "rb") as f:
+        up_to_date = stored == [SRC_SHA, digest(f.read())]
+except FileNotFoundError:
+    up_to_date = False
+if up_to_date:
+    print("tasks.json up to date")
+    sys.exit(0)
 
 PROJ = "Andernet Posture"
 XCPROJ = f"{PROJ}.xcodeproj"
@@ -24,15 +71,81 @@ PM_LINT = {
 }
 PRES = {"reveal": "always", "panel": "shared", "showReuseMessage": False}
 PRES_BUILD = dict(PRES, echo=True, focus=False, clear=True)
+PRES_TEST = dict(PRES, clear=True)
+PRES_DEDICATED = {"reveal": "always", "panel": "dedicated", "clear": True, "showReuseMessage": False}
+
+XB_PREFIX = f"set -o pipefail && xcodebuild -scheme '{PROJ}' -project '{XCPROJ}'"
+CONFIGURATION = "-configuration '${input:configuration}'"
+# Simulator destination and derived data path shared by every build and test
+BASE = (
+    "-destination 'platform=iOS Simulator,name=${input:simulator}'",
+    "-derivedDataPath '.build/DerivedData'",
+)
+
+
+def dump_json(data, pretty=True):
+    """Serialize data as UTF-8 JSON with a trailing newline, 2-space indented if pretty."""
+    if orjson is not None:
+        option = orjson.OPT_APPEND_NEWLINE
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, option=option)
+    if pretty:
+        return (json.dumps(data, indent=2, ensure_ascii=False) + "\n").encode()
+    return (json.dumps(data, separators=(",", ":"), ensure_ascii=False) + "\n").encode()
+
+
+def write_if_changed(path, payload):
+    """Atomically write payload bytes to path unless it already holds them.
+
+    Returns True if the file was written. Skipping identical writes keeps the
+    mtime stable so editors and file watchers don't reload an unchanged file.
+    """
+    try:
+        with open(path, "rb") as f:
+            if f.read() == payload:
+                return False
+    except FileNotFoundError:
+        pass
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+    return True
+
 
 def xb(*extra_args, beautify="--quieter"):
-    base = (
-        f"set -o pipefail && xcodebuild -scheme '{PROJ}' -project '{XCPROJ}'"
-    )
-    args = " ".join(extra_args)
+    command = " ".join((XB_PREFIX,) + extra_args)
     if beautify:
-        return f"{base} {args} 2>&1 | xcbeautify {beautify}"
-    return f"{base} {args}"
+        return f"{command} 2>&1 | xcbeautify {beautify}"
+    return command
+
+
+def shell_task(label, command, *, detail=None, group=None, pm=None, pres=None):
+    """Build a shell task dict, leaving out the optional fields that are unset."""
+    task = {"label": label, "type": "shell"}
+    if detail is not None:
+        task["detail"] = detail
+    task["command"] = command
+    if group is not None:
+        task["group"] = group
+    task["problemMatcher"] = [] if pm is None else pm
+    if pres is not None:
+        task["presentation"] = pres
+    return task
+
+
+def build_task(label, *extra, detail=None, group="build", pres=PRES_BUILD, beautify="--quieter"):
+    """An xcodebuild build task against the selected simulator and configuration."""
+    return shell_task(label, xb(CONFIGURATION, *BASE, *extra, beautify=beautify),
+                      detail=detail, group=group, pm=PM, pres=pres)
+
+
+def test_task(label, action, *, detail=None, group="test", target="Tests"):
+    """An xcodebuild test task for one test target, on the selected simulator."""
+    return shell_task(label, xb(*BASE, f"-only-testing:'{PROJ}{target}'", action, beautify=""),
+                      detail=detail, group=group, pm=PM_TEST, pres=PRES_TEST)
+
 
 data = {
     "version": "2.0.0",
@@ -48,63 +161,32 @@ data = {
     ],
     "tasks": [
         # ── Build ──
-        {"label": "Xcode: Build", "type": "shell",
-         "command": xb("-configuration '${input:configuration}'",
-                       "-destination 'platform=iOS Simulator,name=${input:simulator}'",
-                       "-derivedDataPath '.build/DerivedData'", "build"),
-         "group": {"kind": "build", "isDefault": True},
-         "problemMatcher": PM, "presentation": PRES_BUILD},
-
-        {"label": "Xcode: Build (Clean)", "type": "shell",
-         "command": xb("-configuration '${input:configuration}'",
-                       "-destination 'platform=iOS Simulator,name=${input:simulator}'",
-                       "-derivedDataPath '.build/DerivedData'", "clean build"),
-         "group": "build", "problemMatcher": PM, "presentation": PRES_BUILD},
-
-        {"label": "Xcode: Build (Raw Output)", "type": "shell",
-         "detail": "Full xcodebuild output without xcbeautify",
-         "command": xb("-configuration '${input:configuration}'",
-                       "-destination 'platform=iOS Simulator,name=${input:simulator}'",
-                       "-derivedDataPath '.build/DerivedData'", "build", beautify=None),
-         "group": "build", "problemMatcher": PM,
-         "presentation": {"reveal": "always", "panel": "dedicated", "clear": True, "showReuseMessage": False}},
+        build_task("Xcode: Build", "build", group={"kind": "build", "isDefault": True}),
+
+        build_task("Xcode: Build (Clean)", "clean build"),
+
+        build_task("Xcode: Build (Raw Output)", "build",
+                   detail="Full xcodebuild output without xcbeautify",
+                   pres=PRES_DEDICATED, beautify=None),
 
         # ── Test ──
-        {"label": "Xcode: Run Unit Tests", "type": "shell",
-         "command": xb("-destination 'platform=iOS Simulator,name=${input:simulator}'",
-                       "-derivedDataPath '.build/DerivedData'",
-                       f"-only-testing:'{PROJ}Tests'", "test", beautify=""),
-         "group": {"kind": "test", "isDefault": True},
-         "problemMatcher": PM_TEST, "presentation": dict(PRES, clear=True)},
-
-        {"label": "Xcode: Run UI Tests", "type": "shell",
-         "command": xb("-destination 'platform=iOS Simulator,name=${input:simulator}'",
-                       "-derivedDataPath '.build/DerivedData'",
-                       f"-only-testing:'{PROJ}UITests'", "test", beautify=""),
-         "group": "test", "problemMatcher": PM_TEST, "presentation": dict(PRES, clear=True)},
-
-        {"label": "Xcode: Run Single Test", "type": "shell",
-         "detail": "Run a specific test class or method — prompted for filter",
-         "command": (
-             "FILTER='${input:testFilter}'; "
-             "if [ -z \"$FILTER\" ]; then "
-             + xb("-destination 'platform=iOS Simulator,name=${input:simulator}'",
-                  "-derivedDataPath '.build/DerivedData'",
-                  f"-only-testing:'{PROJ}Tests'", "test", beautify="")
-             + "; else "
-             + xb("-destination 'platform=iOS Simulator,name=${input:simulator}'",
-                  "-derivedDataPath '.build/DerivedData'",
-                  f"-only-testing:\"{PROJ}Tests/$FILTER\"", "test", beautify="")
-             + "; fi"
-         ),
-         "group": "test", "problemMatcher": PM_TEST, "presentation": dict(PRES, clear=True)},
+        test_task("Xcode: Run Unit Tests", "test", group={"kind": "test", "isDefault": True}),
+
+        test_task("Xcode: Run UI Tests", "test", target="UITests"),
+
+        shell_task(
+            "Xcode: Run Single Test",
+            "FILTER='${input:testFilter}'; "
+            "if [ -z \"$FILTER\" ]; then "
+            + xb(*BASE, f"-only-testing:'{PROJ}Tests'", "test", beautify="")
+            + "; else "
+            + xb(*BASE, f"-only-testing:\"{PROJ}Tests/$FILTER\"", "test", beautify="")
+            + "; fi",
+            detail="Run a specific test class or method — prompted for filter",
+            group="test", pm=PM_TEST, pres=PRES_TEST),
 
-        {"label": "Xcode: Test Without Building", "type": "shell",
-         "detail": "Re-run tests using existing build products (faster iteration)",
-         "command": xb("-destination 'platform=iOS Simulator,name=${input:simulator}'",
-                       "-derivedDataPath '.build/DerivedData'",
-                       f"-only-testing:'{PROJ}Tests'", "test-without-building", beautify=""),
-         "group": "test", "problemMatcher": PM_TEST, "presentation": dict(PRES, clear=True)},
+        test_task("Xcode: Test Without Building", "test-without-building",
+                  detail="Re-run tests using existing build products (faster iteration)"),
 
         # ── Simulator ──
         {"label": "Simulator: Boot", "type": "shell",
@@ -226,13 +308,12 @@ data = {
          ),
          "problemMatcher": [], "presentation": PRES},
 
-        {"label": "Xcode: Archive (Release)", "type": "shell",
-         "command": xb("-configuration Release",
-                       "-destination 'generic/platform=iOS'",
-                       "-archivePath '.build/Andernet_Posture.xcarchive'",
-                       "archive", beautify=""),
-         "group": "build", "problemMatcher": PM,
-         "presentation": {"reveal": "always", "panel": "dedicated", "clear": True, "showReuseMessage": False}},
+        shell_task("Xcode: Archive (Release)",
+                   xb("-configuration Release",
+                      "-destination 'generic/platform=iOS'",
+                      "-archivePath '.build/Andernet_Posture.xcarchive'",
+                      "archive", beautify=""),
+                   group="build", pm=PM, pres=PRES_DEDICATED),
 
         {"label": "Xcode: Resolve Packages", "type": "shell",
          "detail": "Re-resolve Swift Package Manager dependencies",
@@ -265,8 +346,7 @@ data = {
     ]
 }
 
-out = os.path.join(os.path.dirname(__file__) if '__file__' in dir() else '.', '/Users/andernet/Documents/GitHub/Andernet-Posture/.vscode/tasks.json')
-with open('/Users/andernet/Documents/GitHub/Andernet-Posture/.vscode/tasks.json', 'w') as f:
-    json.dump(data, f, indent=2)
-    f.write('\n')
-print(f"Written {len(data['tasks'])} tasks to tasks.json")
+payload = dump_json(data, pretty=TASKS_PRETTY)
+if write_if_changed(OUT_PATH, payload):
+    print(f"Written {len(data['tasks'])} tasks to tasks.json")
+write_if_changed(SHA_PATH, f"{SRC_SHA}\n{digest(payload)}\n".encode())
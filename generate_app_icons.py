@@ -5,17 +5,44 @@ generate_app_icons.py — Generates Andernet Posture app icons.
 Produces a 1024×1024 icon in light, dark, and tinted variants, then copies
 them into the Xcode asset catalog and updates Contents.json.
 
+Requires numpy and Pillow; orjson, numba and pillow-simd are optional.
+
+Set ICON_WORK_SIZE (e.g. 512) to rasterize at a smaller size and upscale with
+Lanczos for quick previews; the committed icons are rendered natively at 1024.
+Set ICON_FAST=1 while iterating to save PNGs with zlib level 1 and no optimize
+pass; leave it unset for the release pass that produces the committed images.
+Set ICON_NUMBA=1 to render the glow with a Numba-compiled kernel instead of
+NumPy; importing numba costs more than the NumPy glow, so it is off by default.
+
+Pixel work never goes through Pillow's per-pixel API (img.load(), getpixel,
+putpixel) inside a loop: images cross into NumPy once with np.asarray /
+np.array, are edited with array slicing, and come back with Image.fromarray.
+
+Compositing goes through Pillow's C-level Image.alpha_composite. On x86,
+installing pillow-simd (`pip install pillow-simd`) as a drop-in replacement for
+Pillow vectorizes alpha_composite and resize further with no code changes.
+
 Brand palette:
   Teal: (20, 184, 166) — rgb(0.08, 0.72, 0.65)
   Indigo: (99, 102, 241)
   Dark BG: (8, 20, 30)
 """
 
+import functools
+import io
 import math
 import os
 import json
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
 from PIL import Image, ImageDraw, ImageFont, ImageFilter
 
+try:
+    import orjson
+except ImportError:  # Contents.json is tiny; json writes the same bytes
+    orjson = None
+
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 ASSET_DIR = os.path.join(
     SCRIPT_DIR,
@@ -25,164 +52,290 @@ ASSET_DIR = os.path.join(
 )
 
 SIZE = 1024
+# Working resolution the geometry is rasterized at before resampling to SIZE.
+# Rendering below SIZE visibly stair-steps the rings, so it is for previews only.
+WORK_SIZE = int(os.environ.get("ICON_WORK_SIZE", SIZE))
+PNG_FAST = os.environ.get("ICON_FAST") == "1"
+USE_NUMBA = os.environ.get("ICON_NUMBA") == "1"
+
 TEAL = (20, 184, 166)
 INDIGO = (99, 102, 241)
 DARK_BG = (8, 20, 30)
 DARK_BG2 = (10, 30, 42)
 WHITE = (255, 255, 255)
 
+# Rings are drawn at this multiple of the target resolution, then downsampled
+RING_SUPERSAMPLE = 2
+
+# Every alpha the icon paints with; see rgba_palette()
+ALPHAS = (0, 30, 40, 60, 120, 160, 170, 180, 200, 220, 255)
+
+# Cardinal points of the ring, kept as parallel arrays (one entry per dot) so
+# positions and colors are computed for all dots at once
+CARDINAL_ANGLES = np.array([0, 90, 180, 270])
+CARDINAL_COS = np.cos(np.radians(CARDINAL_ANGLES))
+CARDINAL_SIN = np.sin(np.radians(CARDINAL_ANGLES))
+CARDINAL_T = CARDINAL_ANGLES / 360
+
+# Vertebra widths, top to bottom, before scaling
+SPINE_WIDTHS = (42, 46, 50, 50, 46, 42, 34)
+NUM_VERTEBRAE = len(SPINE_WIDTHS)
+
+
+def dump_json(data):
+    """Encode the asset catalog's Contents.json, indented the way it is committed."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(data, indent=2, ensure_ascii=False) + "\n").encode()
+
+
+def write_if_changed(path, payload):
+    """Replace Contents.json with payload, unless it already holds those bytes.
+
+    Returns True if the file was written. Xcode watches the asset catalog, so
+    an untouched Contents.json doesn't make it re-index the icon set.
+    """
+    try:
+        with open(path, "rb") as f:
+            if f.read() == payload:
+                return False
+    except FileNotFoundError:
+        pass
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+    return True
+
+
+@functools.lru_cache(maxsize=None)
+def rgba_palette(color):
+    """Map each alpha the icon uses to the RGBA fill tuple for color."""
+    return {a: color + (a,) for a in ALPHAS}
+
+
+WHITE_A = rgba_palette(WHITE)
+
 
 def lerp_color(c1, c2, t):
     """Linearly interpolate between two RGB colors."""
-    return tuple(int(a + (b - a) * t) for a, b in zip(c1, c2))
+    return (
+        int(c1[0] + (c2[0] - c1[0]) * t),
+        int(c1[1] + (c2[1] - c1[1]) * t),
+        int(c1[2] + (c2[2] - c1[2]) * t),
+    )
+
+
+def _lerp_np(c1, c2, t):
+    """Vectorized lerp_color: an (..., 3) array of unrounded colors for each value in t."""
+    c1 = np.asarray(c1, dtype=np.float32)
+    c2 = np.asarray(c2, dtype=np.float32)
+    return c1 + (c2 - c1) * np.asarray(t)[..., None]
 
 
-def draw_radial_gradient(img, center, radius, color_center, color_edge, alpha=255):
-    """Draw a radial gradient on an RGBA image."""
-    px = img.load()
+def radial_falloff(width, height, center, radius):
+    """Eased 0→1 distance field from center over a width × height grid."""
     cx, cy = center
-    for y in range(img.height):
-        for x in range(img.width):
-            dx, dy = x - cx, y - cy
-            dist = math.sqrt(dx * dx + dy * dy)
-            t = min(dist / radius, 1.0)
-            # Ease out
-            t = t * t
-            r, g, b = lerp_color(color_center, color_edge, t)
-            # Composite over existing pixel
-            er, eg, eb, ea = px[x, y]
-            a = int(alpha * (1 - t))
-            # Alpha blend
-            out_a = a + ea * (255 - a) // 255
-            if out_a > 0:
-                out_r = (r * a + er * ea * (255 - a) // 255) // out_a
-                out_g = (g * a + eg * ea * (255 - a) // 255) // out_a
-                out_b = (b * a + eb * ea * (255 - a) // 255) // out_a
-            else:
-                out_r, out_g, out_b = 0, 0, 0
-            px[x, y] = (out_r, out_g, out_b, out_a)
+    yy, xx = np.ogrid[0:height, 0:width]
+    r2 = radius * radius
+    # Ease out: (dist / radius)² needs only the squared distance, no sqrt
+    return np.minimum((xx - cx) ** 2 + (yy - cy) ** 2, r2) / r2
+
+
+@functools.lru_cache(maxsize=None)
+def _radial_kernel():
+    """Import numba and return the compiled glow kernel; only used with ICON_NUMBA=1."""
+    from numba import njit, prange
+
+    @njit(parallel=True, cache=True)
+    def kernel(buf, cx, cy, radius, color_center, color_edge, alpha):
+        """Per-pixel radial gradient into a zeroed (H, W, 4) uint8 buffer, rows split across threads."""
+        r2 = radius * radius
+        for y in prange(buf.shape[0]):
+            dy2 = (y - cy) * (y - cy)
+            for x in range(buf.shape[1]):
+                t = min((x - cx) * (x - cx) + dy2, r2) / r2
+                a = int(alpha * (1 - t))
+                if a == 0:
+                    continue
+                for ch in range(3):
+                    buf[y, x, ch] = int(color_center[ch] + (color_edge[ch] - color_center[ch]) * t)
+                buf[y, x, 3] = a
+
+    return kernel
+
+
+def radial_gradient(size, center, radius, color_center, color_edge, alpha=255):
+    """Create a transparent RGBA image holding a radial gradient, for alpha_composite.
+
+    Uses NumPy, or the Numba kernel when ICON_NUMBA=1; both give the same
+    pixels. The image wraps the gradient array without copying it.
+    """
+    width, height = size
+    gradient = np.zeros((height, width, 4), dtype=np.uint8)
+    if USE_NUMBA:
+        cx, cy = center
+        _radial_kernel()(
+            gradient, cx, cy, radius,
+            np.array(color_center, dtype=np.float64),
+            np.array(color_edge, dtype=np.float64),
+            alpha,
+        )
+    else:
+        t = radial_falloff(width, height, center, radius)
 
+        a = (alpha * (1 - t)).astype(np.uint8)
 
-def create_base_background(size):
-    """Create the dark gradient background."""
-    img = Image.new("RGBA", (size, size), DARK_BG + (255,))
-    draw = ImageDraw.Draw(img)
+        gradient[..., :3] = _lerp_np(color_center, color_edge, t)
+        gradient[..., 3] = a
+        # Fully transparent pixels carry no color
+        gradient[a == 0] = 0
+    return Image.frombuffer("RGBA", (width, height), gradient, "raw", "RGBA", 0, 1)
 
-    # Diagonal gradient from dark to slightly lighter
-    for y in range(size):
-        t = y / size
-        c = lerp_color(DARK_BG, DARK_BG2, t)
-        draw.line([(0, y), (size, y)], fill=c + (255,))
 
-    return img
+def vertical_gradient(size, color_top, color_bottom):
+    """Create an opaque RGBA image with a top-to-bottom linear gradient."""
+    rows = _lerp_np(color_top, color_bottom, np.arange(size) / size).astype(np.uint8)
+    rgb = np.broadcast_to(rows[:, None, :], (size, size, 3))
+    opaque = np.full((size, size, 1), 255, dtype=np.uint8)
+    return Image.fromarray(np.concatenate([rgb, opaque], axis=2), "RGBA")
+
 
+def create_base_background(size):
+    """Create the dark gradient background."""
+    # Gradient from dark to slightly lighter
+    return vertical_gradient(size, DARK_BG, DARK_BG2)
 
-def draw_spine_icon(draw, cx, cy, scale=1.0, color_top=TEAL, color_bottom=INDIGO):
-    """Draw a stylized spine / vertebrae column."""
-    num_vertebrae = 7
+
+@functools.lru_cache(maxsize=None)
+def spine_vertebrae(cx, cy, scale=1.0):
+    """Return (bbox, radius, dot_bbox) for each vertebra of the spine, top to bottom."""
     total_height = 280 * scale
-    spacing = total_height / (num_vertebrae - 1)
+    spacing = total_height / (NUM_VERTEBRAE - 1)
     start_y = cy - total_height / 2
+    h = 14 * scale
+    dot_r = 3 * scale
 
-    widths = [42, 46, 50, 50, 46, 42, 34]
-
-    for i in range(num_vertebrae):
-        t = i / (num_vertebrae - 1)
+    vertebrae = []
+    for i, width in enumerate(SPINE_WIDTHS):
         y = start_y + i * spacing
-        w = widths[i] * scale
-        h = 14 * scale
-        color = lerp_color(color_top, color_bottom, t)
-
-        # Main vertebra capsule
-        bbox = [cx - w / 2, y - h / 2, cx + w / 2, y + h / 2]
-        draw.rounded_rectangle(bbox, radius=h / 2, fill=color + (200,))
-
-        # Small bright center dot
-        dot_r = 3 * scale
-        draw.ellipse(
-            [cx - dot_r, y - dot_r, cx + dot_r, y + dot_r],
-            fill=WHITE + (120,),
-        )
+        w = width * scale
+        # Main vertebra capsule with a small bright center dot
+        bbox = (cx - w / 2, y - h / 2, cx + w / 2, y + h / 2)
+        dot_bbox = (cx - dot_r, y - dot_r, cx + dot_r, y + dot_r)
+        vertebrae.append((bbox, h / 2, dot_bbox))
+    return tuple(vertebrae)
 
 
-def draw_figure(draw, cx, cy, scale=1.0, color=TEAL):
-    """Draw a minimalist standing figure silhouette."""
+@functools.lru_cache(maxsize=None)
+def figure_shapes(cx, cy, scale=1.0):
+    """Return (kind, xy, radius, alpha) for each part of the standing figure, in draw order."""
+    shapes = []
+
     # Head
     head_r = 28 * scale
     head_cy = cy - 160 * scale
-    draw.ellipse(
-        [cx - head_r, head_cy - head_r, cx + head_r, head_cy + head_r],
-        fill=color + (220,),
-    )
+    shapes.append((
+        "ellipse",
+        (cx - head_r, head_cy - head_r, cx + head_r, head_cy + head_r),
+        0, 220,
+    ))
 
     # Neck
     neck_w = 8 * scale
-    draw.rounded_rectangle(
-        [cx - neck_w, head_cy + head_r - 4 * scale,
-         cx + neck_w, head_cy + head_r + 20 * scale],
-        radius=neck_w,
-        fill=color + (200,),
-    )
-
-    # Torso
+    shapes.append((
+        "rounded_rectangle",
+        (cx - neck_w, head_cy + head_r - 4 * scale,
+         cx + neck_w, head_cy + head_r + 20 * scale),
+        neck_w, 200,
+    ))
+
+    # Torso as polygon
     torso_top = head_cy + head_r + 16 * scale
     torso_bottom = cy + 40 * scale
     torso_w_top = 36 * scale
     torso_w_bot = 28 * scale
-
-    # Draw torso as polygon
-    draw.polygon(
-        [
+    shapes.append((
+        "polygon",
+        (
             (cx - torso_w_top, torso_top),
             (cx + torso_w_top, torso_top),
             (cx + torso_w_bot, torso_bottom),
             (cx - torso_w_bot, torso_bottom),
-        ],
-        fill=color + (180,),
-    )
+        ),
+        0, 180,
+    ))
 
     # Arms
     arm_w = 8 * scale
     arm_len = 100 * scale
     arm_y = torso_top + 10 * scale
-    for side in [-1, 1]:
+    for side in (-1, 1):
         arm_x = cx + side * torso_w_top
-        draw.rounded_rectangle(
-            [arm_x - arm_w, arm_y,
-             arm_x + arm_w + side * 12 * scale, arm_y + arm_len],
-            radius=arm_w,
-            fill=color + (160,),
-        )
+        shapes.append((
+            "rounded_rectangle",
+            (arm_x - arm_w, arm_y,
+             arm_x + arm_w + side * 12 * scale, arm_y + arm_len),
+            arm_w, 160,
+        ))
 
     # Legs
     leg_w = 10 * scale
     leg_len = 120 * scale
     leg_gap = 14 * scale
-    for side in [-1, 1]:
+    for side in (-1, 1):
         leg_x = cx + side * leg_gap
-        draw.rounded_rectangle(
-            [leg_x - leg_w, torso_bottom - 4 * scale,
-             leg_x + leg_w, torso_bottom + leg_len],
-            radius=leg_w,
-            fill=color + (170,),
-        )
+        shapes.append((
+            "rounded_rectangle",
+            (leg_x - leg_w, torso_bottom - 4 * scale,
+             leg_x + leg_w, torso_bottom + leg_len),
+            leg_w, 170,
+        ))
 
+    return tuple(shapes)
 
-def draw_arc_ring(draw, cx, cy, radius, width, color, start_deg=0, end_deg=270):
-    """Draw a partial arc ring."""
-    bbox = [cx - radius, cy - radius, cx + radius, cy + radius]
-    draw.arc(bbox, start=start_deg, end=end_deg, fill=color + (180,), width=int(width))
 
-
-def draw_posture_lines(draw, cx, cy, scale=1.0):
+def draw_figure(draw, cx, cy, scale=1.0, color=TEAL):
+    """Draw a minimalist standing figure silhouette."""
+    fills = rgba_palette(color)
+    for kind, xy, radius, alpha in figure_shapes(cx, cy, scale):
+        fill = fills[alpha]
+        if kind == "ellipse":
+            draw.ellipse(xy, fill=fill)
+        elif kind == "polygon":
+            draw.polygon(xy, fill=fill)
+        else:
+            draw.rounded_rectangle(xy, radius=radius, fill=fill)
+
+
+def ring_layer(size, cx, cy, radius, width, start_deg=0, end_deg=270, alpha=180):
+    """Rasterize a partial arc ring as an anti-aliased layer: (box, mask, coverage).
+
+    The arc is drawn into a grayscale mask at RING_SUPERSAMPLE× resolution and
+    box-reduced, so each pixel's coverage is the fraction of its subpixels the
+    arc hits: smooth edges in one arc pass, with no ringing outside the stroke.
+    """
+    f = RING_SUPERSAMPLE
+    # Map pixel centers into the supersampled grid
+    o = (f - 1) / 2
+    bbox = [(cx - radius) * f + o, (cy - radius) * f + o,
+            (cx + radius) * f + o, (cy + radius) * f + o]
+    big = Image.new("L", (size * f, size * f), 0)
+    ImageDraw.Draw(big).arc(bbox, start=start_deg, end=end_deg, fill=255, width=int(width) * f)
+    coverage = big.reduce(f)
+    box = coverage.getbbox()
+    coverage = np.array(coverage.crop(box))
+    return box, np.full(coverage.shape, alpha, dtype=np.uint8), coverage
+
+
+def draw_posture_lines(draw, cx, cy, scale=1.0, color=TEAL, line_w=2, tick_w=1):
     """Draw alignment guide lines showing good posture."""
-    line_color = TEAL + (60,)
-    line_w = 2
+    fills = rgba_palette(color)
 
     # Vertical alignment line
     draw.line(
         [(cx, cy - 200 * scale), (cx, cy + 200 * scale)],
-        fill=line_color,
+        fill=fills[60],
         width=line_w,
     )
 
@@ -192,150 +345,275 @@ def draw_posture_lines(draw, cx, cy, scale=1.0):
         half_w = 30 * scale
         draw.line(
             [(cx - half_w, y), (cx + half_w, y)],
-            fill=TEAL + (40,),
-            width=1,
+            fill=fills[40],
+            width=tick_w,
+        )
+
+
+def cardinal_dot_bboxes(cx, cy, radius, dot_r):
+    """Bounding boxes of the accent dots at the ring's cardinal points, in CARDINAL_ANGLES order."""
+    xs = (cx + (radius * CARDINAL_COS).astype(int)).tolist()
+    ys = (cy + (radius * CARDINAL_SIN).astype(int)).tolist()
+    return [[x - dot_r, y - dot_r, x + dot_r, y + dot_r] for x, y in zip(xs, ys)]
+
+
+def _stroke(width, k):
+    """Scale a stroke width by k, keeping it at least 1 px."""
+    return max(1, round(width * k))
+
+
+def _blank_layer(size):
+    """Create a transparent white canvas for rasterizing one mask layer."""
+    canvas = Image.new("RGBA", (size, size), WHITE_A[0])
+    return canvas, ImageDraw.Draw(canvas, "RGBA")
+
+
+def _extract_mask(canvas):
+    """Return (box, mask, None): the canvas alpha cropped to its non-empty bounds."""
+    alpha = canvas.getchannel("A")
+    box = alpha.getbbox()
+    return box, np.array(alpha.crop(box)), None
+
+
+def _shape_layer(kind, bboxes, fill, radius=0):
+    """Rasterize small shapes on a canvas just big enough for them: (box, mask, None).
+
+    kind is "ellipse" or "rounded_rectangle". The shapes are drawn shifted by an
+    even whole-pixel offset, which rasterizes exactly as on a full-size canvas
+    (Pillow rounds .5 coordinates half-to-even, so odd shifts could move edges).
+    """
+    left = math.floor(min(b[0] for b in bboxes)) - 2
+    top = math.floor(min(b[1] for b in bboxes)) - 2
+    left -= left % 2
+    top -= top % 2
+    right = math.ceil(max(b[2] for b in bboxes)) + 2
+    bottom = math.ceil(max(b[3] for b in bboxes)) + 2
+    canvas = Image.new("RGBA", (right - left, bottom - top), WHITE_A[0])
+    draw = ImageDraw.Draw(canvas, "RGBA")
+    for x0, y0, x1, y1 in bboxes:
+        xy = [x0 - left, y0 - top, x1 - left, y1 - top]
+        if kind == "ellipse":
+            draw.ellipse(xy, fill=fill)
+        else:
+            draw.rounded_rectangle(xy, radius=radius, fill=fill)
+    (box_l, box_t, box_r, box_b), mask, _ = _extract_mask(canvas)
+    return (box_l + left, box_t + top, box_r + left, box_b + top), mask, None
+
+
+# Ring layers as (radius, stroke width, start°, end°), laid out for SIZE
+RINGS = {
+    "ring_outer": (380, 4, -30, 210),
+    "ring_outer_bold": (380, 5, -30, 210),
+    "ring_accent": (378, 3, 180, 330),
+    "ring_inner": (340, 2, 45, 315),
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _render_layer(size, name, index=None):
+    """Rasterize one icon layer as an alpha mask, on first use.
+
+    Per-shape layers (one vertebra, one cardinal dot) are picked by index.
+
+    Each layer is drawn once in white and stored as ``(box, mask, coverage)``,
+    where the mask holds the alpha each covered pixel is painted with. Shapes
+    drawn through the draw_* helpers keep their built-in alpha; the cardinal
+    dots and the tinted backplate are opaque and take their opacity from the
+    variant. Hard-edged layers have no coverage; the supersampled rings carry
+    their anti-aliased edge coverage. The cache is per process: each variant
+    renders in its own worker, so a worker rasterizes only the layers its
+    variant uses, and a layer is reused only within that process.
+
+    Geometry is laid out for SIZE and scaled by size / SIZE, so the layers can
+    be rendered at a smaller working size; stroke widths never drop below 1 px.
+    """
+    k = size / SIZE
+    cx, cy = size // 2, size // 2
+
+    if name in RINGS:
+        radius, width, start_deg, end_deg = RINGS[name]
+        return ring_layer(size, cx, cy, radius * k, _stroke(width, k),
+                          start_deg=start_deg, end_deg=end_deg)
+
+    if name == "posture_lines":
+        canvas, draw = _blank_layer(size)
+        draw_posture_lines(
+            draw, cx, cy, scale=1.4 * k, color=WHITE,
+            line_w=_stroke(2, k), tick_w=_stroke(1, k),
         )
+        return _extract_mask(canvas)
+
+    # Standing figure
+    if name == "figure":
+        canvas, draw = _blank_layer(size)
+        draw_figure(draw, cx, cy + 10 * k, scale=1.5 * k, color=WHITE)
+        return _extract_mask(canvas)
+
+    # Spine overlay — one layer per vertebra so each can take its own color
+    vertebrae = spine_vertebrae(cx, cy + 10 * k, scale=1.2 * k)
+    if name == "vertebra_dots":
+        return _shape_layer("ellipse", [dot_bbox for _, _, dot_bbox in vertebrae], WHITE_A[120])
+    if name == "vertebra":
+        bbox, radius, _ = vertebrae[index]
+        return _shape_layer("rounded_rectangle", [bbox], WHITE_A[200], radius=radius)
+
+    # Accent dots at cardinal points of the ring
+    if name == "cardinal":
+        bboxes = cardinal_dot_bboxes(cx, cy, 380 * k, 6 * k)
+        return _shape_layer("ellipse", [bboxes[index]], WHITE_A[255])
+
+    # Tinted variant: filled background circle and its own posture lines
+    if name == "backplate":
+        bg_r = 460 * k
+        return _shape_layer("ellipse", [[cx - bg_r, cy - bg_r, cx + bg_r, cy + bg_r]], WHITE_A[255])
+
+    if name == "tinted_posture_lines":
+        canvas, draw = _blank_layer(size)
+        for offset in [-120, -40, 40, 120]:
+            y = cy + int(offset * 1.4 * k)
+            half_w = int(30 * 1.4 * k)
+            draw.line([(cx - half_w, y), (cx + half_w, y)], fill=WHITE_A[30], width=1)
+        draw.line([(cx, cy - 280 * k), (cx, cy + 280 * k)], fill=WHITE_A[40], width=_stroke(2, k))
+        return _extract_mask(canvas)
+
+    raise KeyError(name)
+
+
+@functools.lru_cache(maxsize=None)
+def spine_layers(color_top, color_bottom):
+    """Layer entries for the spine, graded from color_top to color_bottom."""
+    entries = [
+        (("vertebra", i), lerp_color(color_top, color_bottom, i / (NUM_VERTEBRAE - 1)), 255)
+        for i in range(NUM_VERTEBRAE)
+    ]
+    entries.append(("vertebra_dots", WHITE, 255))
+    return tuple(entries)
+
+
+def cardinal_layers(color_a, color_b, opacity):
+    """Layer entries for the four cardinal dots, graded around the ring."""
+    colors = _lerp_np(color_a, color_b, CARDINAL_T).astype(int).tolist()
+    return [
+        (("cardinal", i), tuple(color), opacity)
+        for i, color in enumerate(colors)
+    ]
+
+
+def compose_layers(img, size, entries):
+    """Paint (layer, color, opacity) entries onto an RGBA image, in order.
+
+    A layer is a name, or a (name, index) pair for per-shape layers.
+
+    Like ImageDraw on an RGBA canvas, covered pixels are overwritten with the
+    tint and the layer's alpha rather than blended with what is underneath.
+    Anti-aliased layers interpolate toward that painted pixel by their edge
+    coverage, as Image.composite would.
+    """
+    out = np.array(img)
+    for layer, color, opacity in entries:
+        key = layer if isinstance(layer, tuple) else (layer,)
+        (left, top, right, bottom), mask, coverage = _render_layer(size, *key)
+        region = out[top:bottom, left:right]
+        if coverage is None:
+            covered = mask > 0
+            region[covered, :3] = color
+            region[covered, 3] = mask[covered].astype(np.uint16) * opacity // 255
+        else:
+            paint = np.empty(region.shape, dtype=np.uint16)
+            paint[..., :3] = color
+            paint[..., 3] = mask.astype(np.uint16) * opacity // 255
+            c = coverage[..., None].astype(np.uint16)
+            region[...] = (paint * c + region * (255 - c) + 127) // 255
+    return Image.fromarray(out, "RGBA")
 
 
 def generate_light_icon(size=SIZE):
     """Generate the main (light appearance) app icon."""
     img = create_base_background(size)
-    draw = ImageDraw.Draw(img, "RGBA")
     cx, cy = size // 2, size // 2
 
     # Subtle radial glow behind the figure
-    glow = Image.new("RGBA", (size, size), (0, 0, 0, 0))
-    draw_radial_gradient(glow, (cx, cy), size // 3, TEAL, DARK_BG, alpha=80)
+    glow = radial_gradient((size, size), (cx, cy), size // 3, TEAL, DARK_BG, alpha=80)
     img = Image.alpha_composite(img, glow)
-    draw = ImageDraw.Draw(img, "RGBA")
-
-    # Posture alignment lines (behind figure)
-    draw_posture_lines(draw, cx, cy, scale=1.4)
-
-    # Outer decorative ring
-    ring_r = 380
-    ring_w = 4
-    draw_arc_ring(draw, cx, cy, ring_r, ring_w, TEAL, start_deg=-30, end_deg=210)
-    draw_arc_ring(draw, cx, cy, ring_r - 2, ring_w - 1, INDIGO, start_deg=180, end_deg=330)
-
-    # Inner ring
-    inner_r = 340
-    draw_arc_ring(draw, cx, cy, inner_r, 2, TEAL, start_deg=45, end_deg=315)
-
-    # Standing figure
-    draw_figure(draw, cx, cy + 10, scale=1.5, color=TEAL)
 
+    entries = [
+        # Posture alignment lines (behind figure)
+        ("posture_lines", TEAL, 255),
+        # Outer decorative ring and inner ring
+        ("ring_outer", TEAL, 255),
+        ("ring_accent", INDIGO, 255),
+        ("ring_inner", TEAL, 255),
+        # Standing figure
+        ("figure", TEAL, 255),
+    ]
     # Spine overlay on the figure's torso
-    draw_spine_icon(draw, cx, cy + 10, scale=1.2)
-
+    entries += spine_layers(TEAL, INDIGO)
     # Small accent dots at cardinal points of the ring
-    dot_r = 6
-    for angle_deg in [0, 90, 180, 270]:
-        angle = math.radians(angle_deg)
-        dx = cx + int(ring_r * math.cos(angle))
-        dy = cy + int(ring_r * math.sin(angle))
-        dot_color = lerp_color(TEAL, INDIGO, angle_deg / 360)
-        draw.ellipse(
-            [dx - dot_r, dy - dot_r, dx + dot_r, dy + dot_r],
-            fill=dot_color + (200,),
-        )
+    entries += cardinal_layers(TEAL, INDIGO, 200)
 
-    return img
+    return compose_layers(img, size, entries)
 
 
 def generate_dark_icon(size=SIZE):
     """Generate the dark appearance icon — deeper background, brighter elements."""
-    img = Image.new("RGBA", (size, size), (4, 10, 16, 255))
-    draw = ImageDraw.Draw(img, "RGBA")
-
     # Even darker gradient
-    for y in range(size):
-        t = y / size
-        c = lerp_color((4, 10, 16), (6, 16, 24), t)
-        draw.line([(0, y), (size, y)], fill=c + (255,))
+    img = vertical_gradient(size, (4, 10, 16), (6, 16, 24))
 
     cx, cy = size // 2, size // 2
 
     # Brighter glow
-    glow = Image.new("RGBA", (size, size), (0, 0, 0, 0))
-    draw_radial_gradient(glow, (cx, cy), size // 3, TEAL, (4, 10, 16), alpha=100)
+    glow = radial_gradient((size, size), (cx, cy), size // 3, TEAL, (4, 10, 16), alpha=100)
     img = Image.alpha_composite(img, glow)
-    draw = ImageDraw.Draw(img, "RGBA")
 
-    # Posture lines
-    draw_posture_lines(draw, cx, cy, scale=1.4)
-
-    # Rings — brighter
+    # Rings and figure — brighter
     bright_teal = (40, 220, 200)
     bright_indigo = (130, 130, 255)
-    ring_r = 380
-    draw_arc_ring(draw, cx, cy, ring_r, 5, bright_teal, start_deg=-30, end_deg=210)
-    draw_arc_ring(draw, cx, cy, ring_r - 2, 3, bright_indigo, start_deg=180, end_deg=330)
-    draw_arc_ring(draw, cx, cy, 340, 2, bright_teal, start_deg=45, end_deg=315)
-
-    # Figure — brighter
-    draw_figure(draw, cx, cy + 10, scale=1.5, color=bright_teal)
-    draw_spine_icon(draw, cx, cy + 10, scale=1.2, color_top=bright_teal, color_bottom=bright_indigo)
-
-    # Cardinal dots
-    dot_r = 6
-    for angle_deg in [0, 90, 180, 270]:
-        angle = math.radians(angle_deg)
-        dx = cx + int(ring_r * math.cos(angle))
-        dy = cy + int(ring_r * math.sin(angle))
-        dot_color = lerp_color(bright_teal, bright_indigo, angle_deg / 360)
-        draw.ellipse(
-            [dx - dot_r, dy - dot_r, dx + dot_r, dy + dot_r],
-            fill=dot_color + (220,),
-        )
+    entries = [
+        ("posture_lines", TEAL, 255),
+        ("ring_outer_bold", bright_teal, 255),
+        ("ring_accent", bright_indigo, 255),
+        ("ring_inner", bright_teal, 255),
+        ("figure", bright_teal, 255),
+    ]
+    entries += spine_layers(bright_teal, bright_indigo)
+    entries += cardinal_layers(bright_teal, bright_indigo, 220)
 
-    return img
+    return compose_layers(img, size, entries)
 
 
 def generate_tinted_icon(size=SIZE):
     """Generate a monochrome tinted icon (used for iOS tinted icon style)."""
     # Start with white figure on transparent — iOS will apply the tint
     img = Image.new("RGBA", (size, size), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img, "RGBA")
-
-    cx, cy = size // 2, size // 2
     mono = (255, 255, 255)
 
-    # Filled background circle
-    bg_r = 460
-    draw.ellipse(
-        [cx - bg_r, cy - bg_r, cx + bg_r, cy + bg_r],
-        fill=(0, 0, 0, 255),
-    )
+    entries = [
+        # Filled background circle
+        ("backplate", (0, 0, 0), 255),
+        ("tinted_posture_lines", mono, 255),
+        ("ring_outer", mono, 255),
+        ("ring_inner", mono, 255),
+        ("figure", mono, 255),
+    ]
+    entries += spine_layers(mono, mono)
+    entries += cardinal_layers(mono, mono, 200)
+
+    return compose_layers(img, size, entries)
+
+
+def render_at(generate, base_size=SIZE, size=SIZE):
+    """Render an icon variant at base_size, resampling it to size with Lanczos."""
+    img = generate(base_size)
+    if base_size != size:
+        img = img.resize((size, size), Image.Resampling.LANCZOS)
+    return img
 
-    # Posture lines
-    for offset in [-120, -40, 40, 120]:
-        y = cy + int(offset * 1.4)
-        half_w = int(30 * 1.4)
-        draw.line([(cx - half_w, y), (cx + half_w, y)], fill=mono + (30,), width=1)
-    draw.line([(cx, cy - 280), (cx, cy + 280)], fill=mono + (40,), width=2)
-
-    # Rings
-    ring_r = 380
-    draw_arc_ring(draw, cx, cy, ring_r, 4, mono, start_deg=-30, end_deg=210)
-    draw_arc_ring(draw, cx, cy, 340, 2, mono, start_deg=45, end_deg=315)
-
-    # Figure
-    draw_figure(draw, cx, cy + 10, scale=1.5, color=mono)
-    draw_spine_icon(draw, cx, cy + 10, scale=1.2, color_top=mono, color_bottom=mono)
-
-    # Cardinal dots
-    dot_r = 6
-    for angle_deg in [0, 90, 180, 270]:
-        angle = math.radians(angle_deg)
-        dx = cx + int(ring_r * math.cos(angle))
-        dy = cy + int(ring_r * math.sin(angle))
-        draw.ellipse(
-            [dx - dot_r, dy - dot_r, dx + dot_r, dy + dot_r],
-            fill=mono + (200,),
-        )
 
-    return img
+VARIANTS = {
+    "light": ("AppIcon-Light.png", generate_light_icon),
+    "dark": ("AppIcon-Dark.png", generate_dark_icon),
+    "tinted": ("AppIcon-Tinted.png", generate_tinted_icon),
+}
 
 
 def update_contents_json():
@@ -374,9 +652,18 @@ def update_contents_json():
     }
 
     path = os.path.join(ASSET_DIR, "Contents.json")
-    with open(path, "w") as f:
-        json.dump(contents, f, indent=2)
-    print(f"  ✓ Updated {path}")
+    if write_if_changed(path, dump_json(contents)):
+        print(f"  ✓ Updated {path}")
+
+
+def _render_one(variant):
+    """Render one icon variant in a worker process and return (filename, png_bytes)."""
+    filename, generate = VARIANTS[variant]
+    buf = io.BytesIO()
+    render_at(generate, WORK_SIZE).save(
+        buf, "PNG", compress_level=1 if PNG_FAST else 9, optimize=not PNG_FAST
+    )
+    return filename, buf.getvalue()
 
 
 def main():
@@ -384,26 +671,16 @@ def main():
 
     print("Generating Andernet Posture app icons…")
 
-    # Light
-    print("  → Light icon…")
-    light = generate_light_icon()
-    light_path = os.path.join(ASSET_DIR, "AppIcon-Light.png")
-    light.save(light_path, "PNG")
-    print(f"  ✓ Saved {light_path}")
-
-    # Dark
-    print("  → Dark icon…")
-    dark = generate_dark_icon()
-    dark_path = os.path.join(ASSET_DIR, "AppIcon-Dark.png")
-    dark.save(dark_path, "PNG")
-    print(f"  ✓ Saved {dark_path}")
-
-    # Tinted
-    print("  → Tinted icon…")
-    tinted = generate_tinted_icon()
-    tinted_path = os.path.join(ASSET_DIR, "AppIcon-Tinted.png")
-    tinted.save(tinted_path, "PNG")
-    print(f"  ✓ Saved {tinted_path}")
+    # The variants share no state, so render them on separate cores
+    print("  → Light, dark and tinted icons…")
+    with ProcessPoolExecutor(max_workers=len(VARIANTS)) as ex:
+        results = list(ex.map(_render_one, VARIANTS))
+
+    for filename, png in results:
+        path = os.path.join(ASSET_DIR, filename)
+        with open(path, "wb") as f:
+            f.write(png)
+        print(f"  ✓ Saved {path}")
 
     # Update Contents.json
     print("  → Updating Contents.json…")